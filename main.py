@@ -1,13 +1,32 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import folium
-from streamlit_folium import st_folium
-from datetime import datetime, timedelta
+from folium.plugins import MarkerCluster
+import streamlit.components.v1 as components
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import glob
 import json
+import os
+import tempfile
+import threading
+import time
+
+# Prefer a faster JSON decoder for the large USGS payloads when available
+try:
+    import orjson as fast_json
+except ImportError:
+    try:
+        import ujson as fast_json
+    except ImportError:
+        fast_json = json
 
 # Page configuration
 st.set_page_config(
@@ -27,17 +46,49 @@ and other sources, featuring interactive maps and visualizations.
 # Sidebar for controls
 st.sidebar.header("📊 Data Controls")
 
+# USGS parameter codes per data type
+PARAM_CODES = {
+    "Streamflow": "00060",  # Discharge, cubic feet per second
+    "Gage Height": "00065"  # Gage height, feet
+}
+
+# Sidebar time period labels and their ISO 8601 durations
+PERIOD_OPTIONS = [
+    ("Last 24 Hours", "P1D"),
+    ("Last 3 Days", "P3D"),
+    ("Last Week", "P7D"),
+    ("Last 30 Days", "P30D")
+]
+
 # API endpoints and functions
 class FloodDataFetcher:
     def __init__(self):
         self.usgs_base_url = "https://waterservices.usgs.gov/nwis/iv/"
         self.rtfi_base_url = "https://api.waterdata.usgs.gov/rtfi-api/v1/"
         
-    def fetch_streamflow_data(self, site_codes=None, states=None, period="P1D"):
-        """Fetch real-time streamflow data from USGS"""
+        # Pooled session so repeated fetches reuse open TLS connections
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        ))
+        
+        # Background pool that warms the disk cache for data types not on screen
+        self._executor = ThreadPoolExecutor(max_workers=len(PARAM_CODES))
+        self._pending = {}
+        self._lock = threading.Lock()
+        
+    def fetch(self, parameter_cd, site_codes=None, states=None, period="P1D", label="USGS"):
+        """Fetch real-time data for a USGS parameter code
+        
+        Returns (points, sites, error). error is None on success, otherwise a
+        message for the caller to show; fetch runs in worker threads, so it
+        must not call st.error itself.
+        """
         params = {
             'format': 'json',
-            'parameterCd': '00060',  # Discharge, cubic feet per second
+            'parameterCd': parameter_cd,
             'period': period,
             'siteStatus': 'active'
         }
@@ -51,95 +102,268 @@ class FloodDataFetcher:
             params['sites'] = '01646500,02231000,07374000,08062500'  # Potomac, St Johns, Mississippi, Trinity
             
         try:
-            response = requests.get(self.usgs_base_url, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            return self.parse_usgs_data(data)
-        except requests.exceptions.RequestException as e:
-            st.error(f"Error fetching streamflow data: {e}")
-            return pd.DataFrame()
+            # Stream the body into one buffer and decode the bytes directly,
+            # skipping the extra copies made by response.content/.text
+            with self._session.get(self.usgs_base_url, params=params, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                buf = bytearray()
+                for chunk in response.iter_content(chunk_size=65536):
+                    buf.extend(chunk)
+            data = fast_json.loads(buf)
+            return (*self.parse_usgs_data(data), None)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return (*self.empty_result(), f"Error fetching {label} data: {e}")
     
-    def fetch_gage_height_data(self, site_codes=None, states=None, period="P1D"):
-        """Fetch real-time gage height data from USGS"""
-        params = {
-            'format': 'json',
-            'parameterCd': '00065',  # Gage height, feet
-            'period': period,
-            'siteStatus': 'active'
-        }
-        
-        if site_codes:
-            params['sites'] = ','.join(site_codes)
-        elif states:
-            params['stateCd'] = ','.join(states)
-        else:
-            params['sites'] = '01646500,02231000,07374000,08062500'
-            
-        try:
-            response = requests.get(self.usgs_base_url, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            return self.parse_usgs_data(data)
-        except requests.exceptions.RequestException as e:
-            st.error(f"Error fetching gage height data: {e}")
-            return pd.DataFrame()
+    def fetch_type(self, data_type, period="P1D"):
+        """Fetch one of the data types in PARAM_CODES"""
+        return self.fetch(PARAM_CODES[data_type], period=period, label=data_type.lower())
+    
+    def prefetch(self, key, job, *args):
+        """Run job on the background pool unless one is already pending for key"""
+        with self._lock:
+            if key not in self._pending:
+                self._pending[key] = self._executor.submit(job, *args)
+    
+    def take_pending(self, key):
+        """Remove and return the pending prefetch for key, if any"""
+        with self._lock:
+            return self._pending.pop(key, None)
+    
+    def clear_pending(self):
+        with self._lock:
+            self._pending.clear()
+    
+    @staticmethod
+    def empty_result():
+        """Empty (points, sites) frames with the same columns and dtypes as parsed data"""
+        points = pd.DataFrame({
+            'site_code': pd.Categorical([]),
+            'datetime': pd.Series(dtype='datetime64[ns, UTC]'),
+            'value': pd.Series(dtype='float32')
+        })
+        sites = pd.DataFrame(
+            columns=['site_name', 'latitude', 'longitude', 'unit', 'parameter'],
+            index=pd.Index([], name='site_code')
+        ).astype({'latitude': 'float32', 'longitude': 'float32'})
+        return points, sites
     
     def parse_usgs_data(self, data):
-        """Parse USGS JSON response into pandas DataFrame"""
+        """Parse USGS JSON response into (points, sites) DataFrames
+        
+        points holds one narrow row per reading (site_code, datetime, value);
+        sites is indexed by site_code and holds the per-site metadata.
+        """
         if not data.get('value', {}).get('timeSeries'):
-            return pd.DataFrame()
+            return self.empty_result()
             
-        records = []
+        frames = []
+        sites = []
         for series in data['value']['timeSeries']:
             site_info = series['sourceInfo']
             site_code = site_info['siteCode'][0]['value']
-            site_name = site_info['siteName']
-            latitude = float(site_info['geoLocation']['geogLocation']['latitude'])
-            longitude = float(site_info['geoLocation']['geogLocation']['longitude'])
             
-            param_info = series['variable']
-            param_name = param_info['variableName']
-            param_unit = param_info['unit']['unitCode'] if param_info.get('unit') else 'N/A'
+            values_list = series['values'][0]['value']
+            if not values_list:
+                continue
+            
+            # Cast whole columns at once instead of building a dict per point
+            vdf = pd.json_normalize(values_list)
+            # USGS always sends ISO 8601 with an offset, so skip per-element format inference.
+            # Sites can span time zones, so everything is kept (and labelled) in UTC
+            vdf['datetime'] = pd.to_datetime(vdf['dateTime'], format='ISO8601', utc=True, cache=True)
+            vdf['value'] = pd.to_numeric(vdf['value'], errors='coerce')
+            vdf = vdf[vdf['value'].notna() & (vdf['value'] != -999999)]  # Filter out missing values
+            if vdf.empty:
+                continue
             
-            for value_data in series['values'][0]['value']:
-                if value_data['value'] != '-999999':  # Filter out missing values
-                    records.append({
-                        'site_code': site_code,
-                        'site_name': site_name,
-                        'latitude': latitude,
-                        'longitude': longitude,
-                        'parameter': param_name,
-                        'unit': param_unit,
-                        'datetime': pd.to_datetime(value_data['dateTime']),
-                        'value': float(value_data['value'])
-                    })
+            param_info = series['variable']
+            sites.append({
+                'site_code': site_code,
+                'site_name': site_info['siteName'],
+                'latitude': float(site_info['geoLocation']['geogLocation']['latitude']),
+                'longitude': float(site_info['geoLocation']['geogLocation']['longitude']),
+                'unit': param_info['unit']['unitCode'] if param_info.get('unit') else 'N/A',
+                'parameter': param_info['variableName']
+            })
+            frames.append(vdf[['datetime', 'value']].assign(site_code=site_code))
+        
+        if not frames:
+            return self.empty_result()
+        
+        points = pd.concat(frames, ignore_index=True)[['site_code', 'datetime', 'value']]
+        
+        # Categorical site codes let groupby/sort work on integer codes
+        points['site_code'] = points['site_code'].astype('category')
         
-        return pd.DataFrame(records)
+        # float32 halves the bytes pickled into the cache and sent to the charts
+        points['value'] = pd.to_numeric(points['value'], downcast='float')
+        
+        # Sorting once here keeps every cached frame in per-site time order
+        points = points.sort_values(['site_code', 'datetime'], ignore_index=True)
+        
+        sites = pd.DataFrame(sites).drop_duplicates('site_code').set_index('site_code').sort_index()
+        for col in ('latitude', 'longitude'):
+            sites[col] = pd.to_numeric(sites[col], downcast='float')
+        return points, sites
+
+# Initialize the data fetcher once per server process; st.cache_resource keeps
+# the same instance (and its open connections) across reruns and sessions
+@st.cache_resource(show_spinner=False)
+def get_fetcher():
+    return FloodDataFetcher()
+
+# On-disk cache shared by all sessions and server restarts
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "flood-monitor-cache")
+CACHE_TTL = 300  # seconds
 
-# Initialize the data fetcher
-@st.cache_data(ttl=300)  # Cache for 5 minutes
+def _cached_parquet_paths(data_type, period):
+    """(points, sites) parquet cache paths for a data type and period"""
+    return [_cached_parquet_path(data_type, period, table) for table in ("points", "sites")]
+
+def _cached_parquet_path(data_type, period, table):
+    """Parquet cache path for one table in the current 5 minute bucket"""
+    bucket = int(time.time()) // CACHE_TTL
+    key = data_type.lower().replace(' ', '_')
+    return os.path.join(CACHE_DIR, f"{key}_{table}_{period}_{bucket}.parquet")
+
+def _read_cached(path):
+    try:
+        return pd.read_parquet(path, engine='pyarrow')
+    except (OSError, ValueError):
+        return None
+
+def _write_cached(df, path):
+    # Empty results are written too, so a type with no sites still counts as a hit
+    prefix = path.rsplit('_', 1)[0]
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        df.to_parquet(tmp_path, engine='pyarrow', compression='zstd')
+        os.replace(tmp_path, path)  # Atomic so other sessions never read a partial file
+        # Drop files from earlier buckets for this key
+        for stale in glob.glob(f"{prefix}_*.parquet"):
+            if stale != path:
+                os.remove(stale)
+    except (OSError, ValueError):
+        pass
+
+def clear_disk_cache():
+    for path in glob.glob(os.path.join(CACHE_DIR, "*.parquet")):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def _fetch_to_disk(fetcher, data_type, period, paths):
+    """Fetch one data type and, on success, write it to the disk cache"""
+    points, sites, error = fetcher.fetch_type(data_type, period=period)
+    if error is None:
+        for df, path in zip((points, sites), paths):
+            _write_cached(df, path)
+    fetcher.take_pending(paths[0])
+    return points, sites, error
+
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
 def get_flood_data(data_type, period):
-    fetcher = FloodDataFetcher()
-    if data_type == "Streamflow":
-        return fetcher.fetch_streamflow_data(period=period)
+    """Return the (points, sites) frames for one data type"""
+    paths = _cached_parquet_paths(data_type, period)
+    tables = [_read_cached(path) for path in paths]
+    if all(df is not None for df in tables):
+        return tuple(tables)
+    
+    # Reuse a background prefetch of this type if one is already running
+    fetcher = get_fetcher()
+    pending = fetcher.take_pending(paths[0])
+    points, sites, error = pending.result() if pending else _fetch_to_disk(fetcher, data_type, period, paths)
+    if error:
+        st.error(error)  # Replayed by st.cache_data on later reruns
+        return points, sites
+    
+    # Warm the disk cache for the other types so switching data type is fast
+    for other_type in PARAM_CODES:
+        other_paths = _cached_parquet_paths(other_type, period)
+        if other_type != data_type and not os.path.exists(other_paths[0]):
+            fetcher.prefetch(other_paths[0], _fetch_to_disk, fetcher, other_type, period, other_paths)
+    return points, sites
+
+@st.cache_data(ttl=300, show_spinner=False)
+def build_map_html(data_type, period, site_codes, data_version, _latest_data):
+    """Render the site map to an HTML string, cached per data type, period, site set and data version"""
+    latest_data = _latest_data.copy()
+    
+    # Create folium map (canvas rendering scales far better than DOM markers)
+    center_lat = latest_data['latitude'].mean()
+    center_lon = latest_data['longitude'].mean()
+    m = folium.Map(location=[center_lat, center_lon], zoom_start=6, prefer_canvas=True)
+    
+    # Color code based on current value (simple thresholds)
+    thresholds = np.array([5000, 10000]) if data_type == "Streamflow" else np.array([10, 20])
+    color_palette = np.array(['green', 'orange', 'red'])
+    latest_data['color'] = color_palette[np.searchsorted(thresholds, latest_data['value'].to_numpy())]
+    
+    # Precompute popup and tooltip text for every site in one pass
+    value_label = latest_data['value'].map('{:.2f}'.format) + ' ' + latest_data['unit'].astype(str)
+    latest_data['tooltip'] = latest_data['site_name'].astype(str) + ': ' + value_label
+    latest_data['popup_html'] = (
+        '<b>' + latest_data['site_name'].astype(str) + '</b><br>'
+        + 'Site: ' + latest_data['site_code'].astype(str) + '<br>'
+        + f'Current {data_type}: ' + value_label + '<br>'
+        + 'Last Updated: ' + latest_data['datetime'].dt.strftime('%m/%d/%Y %H:%M UTC')
+    )
+    
+    # Add markers for each site
+    if len(latest_data) > 500:
+        # Too many sites for individual markers; ship one clustered GeoJSON layer
+        geojson = {
+            'type': 'FeatureCollection',
+            'features': [
+                {
+                    'type': 'Feature',
+                    'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+                    'properties': {'color': color, 'tooltip': tooltip, 'popup': popup}
+                }
+                for lat, lon, color, tooltip, popup in zip(
+                    latest_data['latitude'], latest_data['longitude'], latest_data['color'],
+                    latest_data['tooltip'], latest_data['popup_html']
+                )
+            ]
+        }
+        folium.GeoJson(
+            geojson,
+            marker=folium.CircleMarker(radius=6, fill=True, fill_opacity=0.8),
+            style_function=lambda f: {
+                'color': f['properties']['color'],
+                'fillColor': f['properties']['color']
+            },
+            tooltip=folium.GeoJsonTooltip(fields=['tooltip'], labels=False),
+            popup=folium.GeoJsonPopup(fields=['popup'], labels=False, max_width=250)
+        ).add_to(MarkerCluster().add_to(m))
     else:
-        return fetcher.fetch_gage_height_data(period=period)
+        for row in latest_data.itertuples(index=False):
+            folium.CircleMarker(
+                [row.latitude, row.longitude],
+                radius=8,
+                color=row.color,
+                fill=True,
+                fill_color=row.color,
+                fill_opacity=0.8,
+                popup=folium.Popup(row.popup_html, max_width=250),
+                tooltip=row.tooltip
+            ).add_to(m)
+    
+    return m.get_root().render()
 
 # Sidebar controls
 data_type = st.sidebar.selectbox(
     "Select Data Type",
-    ["Streamflow", "Gage Height"]
+    list(PARAM_CODES)
 )
 
-time_period = st.sidebar.selectbox(
+period_code = st.sidebar.selectbox(
     "Time Period",
-    {
-        "Last 24 Hours": "P1D",
-        "Last 3 Days": "P3D", 
-        "Last Week": "P7D",
-        "Last 30 Days": "P30D"
-    }
-)
+    PERIOD_OPTIONS,
+    format_func=lambda option: option[0]
+)[1]
 
 # Custom site codes input
 custom_sites = st.sidebar.text_input(
@@ -151,71 +375,50 @@ custom_sites = st.sidebar.text_input(
 # Refresh button
 if st.sidebar.button("🔄 Refresh Data"):
     st.cache_data.clear()
+    get_fetcher().clear_pending()
+    clear_disk_cache()
 
 # Main content
 with st.spinner("Loading flood data..."):
-    # Get period code
-    period_code = {
-        "Last 24 Hours": "P1D",
-        "Last 3 Days": "P3D", 
-        "Last Week": "P7D",
-        "Last 30 Days": "P30D"
-    }[time_period]
-    
-    df = get_flood_data(data_type, period_code)
+    df, sites_df = get_flood_data(data_type, period_code)
 
 if df.empty:
     st.warning("No data available for the selected criteria. Please try different parameters.")
     st.stop()
 
+# Latest reading per site, shared by the metrics, map and flood risk table
+latest_data = (
+    df.drop_duplicates('site_code', keep='last')
+    .join(sites_df, on='site_code')
+    .reset_index(drop=True)
+)
+site_name_map = sites_df['site_name'].to_dict()
+unit_label = sites_df['unit'].iat[0]
+
 # Data overview
 st.subheader("📈 Data Overview")
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    st.metric("Total Sites", len(df['site_code'].unique()))
+    st.metric("Total Sites", len(latest_data))
 with col2:
     st.metric("Data Points", len(df))
 with col3:
-    latest_value = df.groupby('site_code')['value'].last().mean()
+    latest_value = latest_data['value'].mean()
     st.metric(f"Avg Current {data_type}", f"{latest_value:.2f}")
 with col4:
-    st.metric("Last Updated", df['datetime'].max().strftime("%H:%M %m/%d"))
+    st.metric("Last Updated", df['datetime'].max().strftime("%H:%M %m/%d UTC"))
 
 # Interactive map
 st.subheader("🗺️ Site Locations Map")
 
-# Get latest data for each site for map display
-latest_data = df.groupby('site_code').last().reset_index()
-
-# Create folium map
-center_lat = latest_data['latitude'].mean()
-center_lon = latest_data['longitude'].mean()
-m = folium.Map(location=[center_lat, center_lon], zoom_start=6)
-
-# Add markers for each site
-for _, row in latest_data.iterrows():
-    # Color code based on current value (simple thresholds)
-    value = row['value']
-    if data_type == "Streamflow":
-        color = 'red' if value > 10000 else 'orange' if value > 5000 else 'green'
-    else:  # Gage Height
-        color = 'red' if value > 20 else 'orange' if value > 10 else 'green'
-    
-    folium.Marker(
-        [row['latitude'], row['longitude']],
-        popup=folium.Popup(f"""
-            <b>{row['site_name']}</b><br>
-            Site: {row['site_code']}<br>
-            Current {data_type}: {value:.2f} {row['unit']}<br>
-            Last Updated: {row['datetime'].strftime('%m/%d/%Y %H:%M')}
-        """, max_width=250),
-        tooltip=f"{row['site_name']}: {value:.2f} {row['unit']}",
-        icon=folium.Icon(color=color, icon='tint')
-    ).add_to(m)
-
-# Display map
-map_data = st_folium(m, width=700, height=500)
+# Display map (rendered HTML is cached, so reruns from other widgets skip folium)
+# _latest_data is not hashed, so key the cache on a hash of the readings it renders
+data_version = int(pd.util.hash_pandas_object(
+    latest_data[['site_code', 'datetime', 'value']], index=False
+).sum())
+map_html = build_map_html(data_type, period_code, tuple(latest_data['site_code']), data_version, latest_data)
+components.html(map_html, height=500)
 
 # Time series visualization
 st.subheader("📊 Time Series Analysis")
@@ -223,25 +426,26 @@ st.subheader("📊 Time Series Analysis")
 # Site selector for detailed view
 selected_sites = st.multiselect(
     "Select sites for detailed analysis",
-    options=df['site_code'].unique(),
-    default=df['site_code'].unique()[:3],  # Default to first 3 sites
-    format_func=lambda x: f"{x} - {df[df['site_code']==x]['site_name'].iloc[0]}"
+    options=list(site_name_map),
+    default=list(site_name_map)[:3],  # Default to first 3 sites
+    format_func=lambda x: f"{x} - {site_name_map[x]}"
 )
 
 if selected_sites:
     # Filter data for selected sites
     filtered_df = df[df['site_code'].isin(selected_sites)]
     
-    # Create time series plot
+    # Create time series plot (WebGL keeps multi-site, multi-day series responsive)
     fig = px.line(
         filtered_df,
         x='datetime',
         y='value',
         color='site_code',
+        render_mode='webgl',
         title=f'{data_type} Over Time',
         labels={
-            'datetime': 'Date/Time',
-            'value': f'{data_type} ({filtered_df["unit"].iloc[0]})',
+            'datetime': 'Date/Time (UTC)',
+            'value': f'{data_type} ({unit_label})',
             'site_code': 'Site Code'
         }
     )
@@ -255,14 +459,21 @@ if selected_sites:
     
     # Statistics table
     st.subheader("📋 Site Statistics")
-    stats_df = filtered_df.groupby(['site_code', 'site_name']).agg({
-        'value': ['min', 'max', 'mean', 'std', 'count'],
-        'latitude': 'first',
-        'longitude': 'first'
-    }).round(2)
+    value_stats = filtered_df.groupby('site_code', observed=True, sort=False).agg(**{
+        'Min': ('value', 'min'),
+        'Max': ('value', 'max'),
+        'Mean': ('value', 'mean'),
+        'Std Dev': ('value', 'std'),
+        'Data Points': ('value', 'count')
+    })
     
-    # Flatten column names
-    stats_df.columns = ['Min', 'Max', 'Mean', 'Std Dev', 'Data Points', 'Latitude', 'Longitude']
+    # Site metadata lives in sites_df; join it on only for this table
+    site_columns = sites_df[['site_name', 'latitude', 'longitude']].set_axis(
+        ['Site Name', 'Latitude', 'Longitude'], axis=1
+    )
+    stats_df = value_stats.join(site_columns)[
+        ['Site Name', 'Min', 'Max', 'Mean', 'Std Dev', 'Data Points', 'Latitude', 'Longitude']
+    ].round(2)
     st.dataframe(stats_df, use_container_width=True)
 
 # Distribution analysis
@@ -270,26 +481,36 @@ st.subheader("📈 Value Distribution Analysis")
 col1, col2 = st.columns(2)
 
 with col1:
-    # Histogram
-    fig_hist = px.histogram(
-        df,
-        x='value',
-        nbins=30,
+    # Histogram, binned here so only the 30 bar heights are sent to the browser
+    counts, edges = np.histogram(df['value'].to_numpy(), bins=30)
+    fig_hist = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges)
+    ))
+    fig_hist.update_layout(
         title=f'{data_type} Distribution',
-        labels={'value': f'{data_type} ({df["unit"].iloc[0]})'}
+        xaxis_title=f'{data_type} ({unit_label})',
+        yaxis_title='count',
+        bargap=0
     )
     st.plotly_chart(fig_hist, use_container_width=True)
 
 with col2:
     # Box plot by site
     if len(selected_sites) > 1:
+        # Cap each site at 5000 random points; the quartiles barely move and
+        # the browser no longer receives every raw reading
+        shuffled = filtered_df.sample(frac=1, random_state=0)
+        box_df = shuffled[shuffled.groupby('site_code', observed=True).cumcount() < 5000]
+        
         fig_box = px.box(
-            filtered_df,
+            box_df,
             x='site_code',
             y='value',
             title=f'{data_type} by Site',
             labels={
-                'value': f'{data_type} ({filtered_df["unit"].iloc[0]})',
+                'value': f'{data_type} ({unit_label})',
                 'site_code': 'Site Code'
             }
         )
@@ -301,43 +522,17 @@ with col2:
 # Recent alerts section
 st.subheader("⚠️ Potential Flood Conditions")
 
-# Simple flood risk assessment based on thresholds
-flood_risks = []
-for site_code in df['site_code'].unique():
-    site_data = df[df['site_code'] == site_code].sort_values('datetime')
-    latest_value = site_data['value'].iloc[-1]
-    site_name = site_data['site_name'].iloc[0]
-    
-    # Simple thresholds (these would be customized per site in production)
-    if data_type == "Streamflow":
-        if latest_value > 15000:
-            risk_level = "HIGH"
-            color = "🔴"
-        elif latest_value > 8000:
-            risk_level = "MODERATE"
-            color = "🟡"
-        else:
-            risk_level = "LOW"
-            color = "🟢"
-    else:  # Gage Height
-        if latest_value > 25:
-            risk_level = "HIGH"
-            color = "🔴"
-        elif latest_value > 15:
-            risk_level = "MODERATE" 
-            color = "🟡"
-        else:
-            risk_level = "LOW"
-            color = "🟢"
-    
-    flood_risks.append({
-        'Site': f"{site_code} - {site_name}",
-        'Current Value': f"{latest_value:.2f} {site_data['unit'].iloc[0]}",
-        'Risk Level': f"{color} {risk_level}",
-        'Last Updated': site_data['datetime'].iloc[-1].strftime('%m/%d/%Y %H:%M')
-    })
+# Simple thresholds (these would be customized per site in production)
+risk_thresholds = np.array([8000, 15000]) if data_type == "Streamflow" else np.array([15, 25])
+risk_palette = np.array(["🟢 LOW", "🟡 MODERATE", "🔴 HIGH"])
+risk_level = risk_palette[np.searchsorted(risk_thresholds, latest_data['value'].to_numpy())]
 
-risk_df = pd.DataFrame(flood_risks)
+risk_df = pd.DataFrame({
+    'Site': latest_data['site_code'].astype(str) + ' - ' + latest_data['site_name'].astype(str),
+    'Current Value': latest_data['value'].map('{:.2f}'.format) + ' ' + latest_data['unit'].astype(str),
+    'Risk Level': risk_level,
+    'Last Updated': latest_data['datetime'].dt.strftime('%m/%d/%Y %H:%M UTC')
+})
 st.dataframe(risk_df, use_container_width=True, hide_index=True)
 
 # Footer with data source info
@@ -350,4 +545,4 @@ please consult your local emergency management agency and the National Weather S
 """)
 
 # Add refresh timestamp
-st.caption(f"Last refreshed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
\ No newline at end of file
+st.caption(f"Last refreshed: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')} UTC")
\ No newline at end of file